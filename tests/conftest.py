@@ -0,0 +1,44 @@
+"""
+Shared fixtures for the Mergington High School API tests
+"""
+import copy
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app import app, activities
+
+# The true original state is whatever app.py defines at import time;
+# snapshot it once so the reset fixture never has to re-derive it.
+_PRISTINE = copy.deepcopy(activities)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    """Create a test client shared by the whole session"""
+    # ASGITransport calls the app in-process on the event loop, avoiding
+    # the thread portal TestClient uses for every request. The client is
+    # stateless; per-test isolation of the mutable activities dict is
+    # handled by the reset_activities fixture.
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as test_client:
+        yield test_client
+
+
+@pytest.fixture(autouse=True)
+def reset_activities(request):
+    """Reset activities data before each test that mutates it"""
+    # Read-only tests skip the snapshot entirely
+    if request.node.get_closest_marker("mutates_activities") is None:
+        yield
+        return
+
+    yield
+
+    # Restore from the import-time snapshot, in place so existing
+    # references to the participant lists stay valid
+    for name, pristine in _PRISTINE.items():
+        activities[name]["participants"][:] = pristine["participants"]
@@ -2,50 +2,30 @@
 Tests for the Mergington High School API
 """
 import pytest
-from fastapi.testclient import TestClient
-import sys
-from pathlib import Path
-
-# Add src directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
-from app import app, activities
-
-
-@pytest.fixture
-def client():
-    """Create a test client"""
-    return TestClient(app)
-
-
-@pytest.fixture(autouse=True)
-def reset_activities():
-    """Reset activities data before each test"""
-    # Store original state
-    original_activities = {
-        name: {
-            "description": details["description"],
-            "schedule": details["schedule"],
-            "max_participants": details["max_participants"],
-            "participants": details["participants"].copy()
-        }
-        for name, details in activities.items()
-    }
-    
-    yield
-    
-    # Reset to original state after each test
-    for name, details in original_activities.items():
-        if name in activities:
-            activities[name]["participants"] = details["participants"].copy()
+from urllib.parse import quote
+
+from app import activities
+
+# Pre-encoded URL paths so tests don't percent-encode by hand
+ACTIVITY_PATHS = {name: f"/activities/{quote(name)}" for name in activities}
+CHESS_CLUB = ACTIVITY_PATHS["Chess Club"]
+
+
+def _seed(activity, email):
+    """Add a participant directly, skipping the signup round-trip.
+
+    The reset_activities fixture restores participant lists afterwards,
+    so tests can arrange state without going through the API.
+    """
+    activities[activity]["participants"].append(email)
 
 
 class TestRootEndpoint:
     """Tests for the root endpoint"""
     
-    def test_root_redirects_to_index(self, client):
+    async def test_root_redirects_to_index(self, client):
         """Test that root redirects to static index.html"""
-        response = client.get("/", follow_redirects=False)
+        response = await client.get("/", follow_redirects=False)
         assert response.status_code == 307
         assert response.headers["location"] == "/static/index.html"
 
@@ -53,17 +33,17 @@ class TestRootEndpoint:
 class TestGetActivities:
     """Tests for GET /activities endpoint"""
     
-    def test_get_activities_returns_all_activities(self, client):
+    async def test_get_activities_returns_all_activities(self, client):
         """Test that GET /activities returns all activities"""
-        response = client.get("/activities")
+        response = await client.get("/activities")
         assert response.status_code == 200
         data = response.json()
         assert isinstance(data, dict)
         assert len(data) > 0
     
-    def test_get_activities_structure(self, client):
+    async def test_get_activities_structure(self, client):
         """Test that activities have the correct structure"""
-        response = client.get("/activities")
+        response = await client.get("/activities")
         data = response.json()
         
         for activity_name, activity in data.items():
@@ -78,169 +58,178 @@ class TestGetActivities:
 class TestSignupForActivity:
     """Tests for POST /activities/{activity_name}/signup endpoint"""
     
-    def test_signup_success(self, client):
+    pytestmark = pytest.mark.mutates_activities
+    
+    async def test_signup_success(self, client):
         """Test successful signup for an activity"""
-        response = client.post(
-            "/activities/Chess%20Club/signup?email=newstudent@mergington.edu"
+        response = await client.post(
+            f"{CHESS_CLUB}/signup",
+            params={"email": "newstudent@mergington.edu"}
         )
         assert response.status_code == 200
         data = response.json()
         assert "message" in data
         assert "newstudent@mergington.edu" in data["message"]
     
-    def test_signup_adds_participant(self, client):
+    async def test_signup_adds_participant(self, client):
         """Test that signup actually adds participant to activity"""
         email = "teststudent@mergington.edu"
-        client.post(f"/activities/Chess%20Club/signup?email={email}")
+        await client.post(f"{CHESS_CLUB}/signup", params={"email": email})
         
-        response = client.get("/activities")
+        response = await client.get("/activities")
         data = response.json()
         assert email in data["Chess Club"]["participants"]
     
-    def test_signup_duplicate_email(self, client):
+    async def test_signup_duplicate_email(self, client):
         """Test that signing up the same email twice fails"""
         email = "duplicate@mergington.edu"
         
         # First signup should succeed
-        response1 = client.post(f"/activities/Chess%20Club/signup?email={email}")
+        response1 = await client.post(f"{CHESS_CLUB}/signup", params={"email": email})
         assert response1.status_code == 200
         
         # Second signup should fail
-        response2 = client.post(f"/activities/Chess%20Club/signup?email={email}")
+        response2 = await client.post(f"{CHESS_CLUB}/signup", params={"email": email})
         assert response2.status_code == 400
         assert "already signed up" in response2.json()["detail"]
-    
-    def test_signup_invalid_activity(self, client):
-        """Test signup for non-existent activity"""
-        response = client.post(
-            "/activities/NonExistentActivity/signup?email=test@mergington.edu"
+
+    @pytest.mark.parametrize(
+        "activity", ["Chess Club", "Programming Class", "Gym Class"]
+    )
+    async def test_signup_per_activity(self, client, activity):
+        """Test that signup works the same across activities"""
+        email = "multisignup@mergington.edu"
+        response = await client.post(
+            f"{ACTIVITY_PATHS[activity]}/signup", params={"email": email}
         )
-        assert response.status_code == 404
-        assert "not found" in response.json()["detail"].lower()
-    
-    def test_signup_requires_email(self, client):
-        """Test that email parameter is required"""
-        response = client.post("/activities/Chess%20Club/signup")
-        assert response.status_code == 422  # Validation error
+        assert response.status_code == 200
+        assert email in activities[activity]["participants"]
 
 
 class TestUnregisterFromActivity:
     """Tests for DELETE /activities/{activity_name}/unregister endpoint"""
     
-    def test_unregister_success(self, client):
+    pytestmark = pytest.mark.mutates_activities
+    
+    async def test_unregister_success(self, client):
         """Test successful unregistration from an activity"""
         # First sign up a student
         email = "tounregister@mergington.edu"
-        client.post(f"/activities/Chess%20Club/signup?email={email}")
-        
+        _seed("Chess Club", email)
+
         # Then unregister
-        response = client.delete(
-            f"/activities/Chess%20Club/unregister?email={email}"
+        response = await client.delete(
+            f"{CHESS_CLUB}/unregister", params={"email": email}
         )
         assert response.status_code == 200
         data = response.json()
         assert "message" in data
         assert email in data["message"]
     
-    def test_unregister_removes_participant(self, client):
+    async def test_unregister_removes_participant(self, client):
         """Test that unregister actually removes participant from activity"""
         email = "toremove@mergington.edu"
-        
+
         # Sign up
-        client.post(f"/activities/Chess%20Club/signup?email={email}")
-        
+        _seed("Chess Club", email)
+
         # Unregister
-        client.delete(f"/activities/Chess%20Club/unregister?email={email}")
+        await client.delete(f"{CHESS_CLUB}/unregister", params={"email": email})
         
         # Verify removal
-        response = client.get("/activities")
+        response = await client.get("/activities")
         data = response.json()
         assert email not in data["Chess Club"]["participants"]
     
-    def test_unregister_not_signed_up(self, client):
+    async def test_unregister_not_signed_up(self, client):
         """Test unregistering a student that's not signed up"""
-        response = client.delete(
-            "/activities/Chess%20Club/unregister?email=notsignedup@mergington.edu"
+        response = await client.delete(
+            f"{CHESS_CLUB}/unregister",
+            params={"email": "notsignedup@mergington.edu"}
         )
         assert response.status_code == 400
         assert "not signed up" in response.json()["detail"]
     
-    def test_unregister_invalid_activity(self, client):
-        """Test unregister from non-existent activity"""
-        response = client.delete(
-            "/activities/NonExistentActivity/unregister?email=test@mergington.edu"
-        )
-        assert response.status_code == 404
-        assert "not found" in response.json()["detail"].lower()
-    
-    def test_unregister_requires_email(self, client):
-        """Test that email parameter is required"""
-        response = client.delete("/activities/Chess%20Club/unregister")
-        assert response.status_code == 422  # Validation error
-    
-    def test_unregister_existing_participant(self, client):
+    async def test_unregister_existing_participant(self, client):
         """Test unregistering an existing participant"""
         # Use an existing participant from the initial data
         email = "michael@mergington.edu"
         
-        response = client.delete(
-            f"/activities/Chess%20Club/unregister?email={email}"
+        response = await client.delete(
+            f"{CHESS_CLUB}/unregister", params={"email": email}
         )
         assert response.status_code == 200
         
         # Verify removal
-        response = client.get("/activities")
+        response = await client.get("/activities")
         data = response.json()
         assert email not in data["Chess Club"]["participants"]
 
 
+class TestValidationErrors:
+    """Parametrized validation-error tests shared by both endpoints"""
+
+    @pytest.mark.parametrize("method,path", [
+        pytest.param(
+            "post", "/activities/NonExistentActivity/signup",
+            id="signup"),
+        pytest.param(
+            "delete", "/activities/NonExistentActivity/unregister",
+            id="unregister"),
+    ])
+    async def test_not_found(self, client, method, path):
+        """Test that both endpoints 404 for a non-existent activity"""
+        response = await client.request(
+            method, path, params={"email": "test@mergington.edu"}
+        )
+        assert response.status_code == 404
+        assert "not found" in response.json()["detail"].lower()
+
+    @pytest.mark.parametrize("method,path", [
+        pytest.param(
+            "post", f"{CHESS_CLUB}/signup",
+            id="signup-missing-email"),
+        pytest.param(
+            "delete", f"{CHESS_CLUB}/unregister",
+            id="unregister-missing-email"),
+    ])
+    async def test_requires_email(self, client, method, path):
+        """Test that email parameter is required on both endpoints"""
+        response = await client.request(method, path)
+        assert response.status_code == 422  # Validation error
+
+
 class TestIntegration:
     """Integration tests for the API"""
     
-    def test_signup_and_unregister_workflow(self, client):
+    pytestmark = pytest.mark.mutates_activities
+    
+    async def test_signup_and_unregister_workflow(self, client):
         """Test complete workflow of signing up and unregistering"""
         email = "workflow@mergington.edu"
         activity = "Chess Club"
-        
-        # Get initial participant count
-        response = client.get("/activities")
-        initial_count = len(response.json()[activity]["participants"])
-        
-        # Sign up
-        signup_response = client.post(
-            f"/activities/{activity.replace(' ', '%20')}/signup?email={email}"
+
+        # Get initial participants
+        response = await client.get("/activities")
+        initial = response.json()[activity]["participants"]
+
+        # Sign up; the response message confirms the addition without
+        # re-fetching the whole activities dict
+        signup_response = await client.post(
+            f"{ACTIVITY_PATHS[activity]}/signup", params={"email": email}
         )
         assert signup_response.status_code == 200
-        
-        # Verify participant was added
-        response = client.get("/activities")
-        assert len(response.json()[activity]["participants"]) == initial_count + 1
-        assert email in response.json()[activity]["participants"]
-        
+        assert email in signup_response.json()["message"]
+
         # Unregister
-        unregister_response = client.delete(
-            f"/activities/{activity.replace(' ', '%20')}/unregister?email={email}"
+        unregister_response = await client.delete(
+            f"{ACTIVITY_PATHS[activity]}/unregister", params={"email": email}
         )
         assert unregister_response.status_code == 200
-        
-        # Verify participant was removed
-        response = client.get("/activities")
-        assert len(response.json()[activity]["participants"]) == initial_count
-        assert email not in response.json()[activity]["participants"]
-    
-    def test_multiple_activities_signup(self, client):
-        """Test signing up for multiple activities"""
-        email = "multisignup@mergington.edu"
-        activities_to_join = ["Chess Club", "Programming Class", "Gym Class"]
-        
-        for activity in activities_to_join:
-            response = client.post(
-                f"/activities/{activity.replace(' ', '%20')}/signup?email={email}"
-            )
-            assert response.status_code == 200
-        
-        # Verify student is in all activities
-        response = client.get("/activities")
-        data = response.json()
-        for activity in activities_to_join:
-            assert email in data[activity]["participants"]
+        assert email in unregister_response.json()["message"]
+
+        # Single final fetch: state is back to where it started
+        response = await client.get("/activities")
+        final = response.json()[activity]["participants"]
+        assert email not in final
+        assert set(final) == set(initial)